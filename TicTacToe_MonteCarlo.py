@@ -1,474 +1,848 @@
-from typing import Any
-from random import randint
-import copy
-import math
-
-class Node:
-    """A node to be inserted into the tree during the Monte Carlo Tree Search.
-    New nodes are created during the expand() function and the make_comp_move() 
-    function.
-
-    Attributes
-        wins: number of wins acheived by traversing path with this node
-        visits: number of times node has been traversed
-        children: nodes that represent legal next moves
-        parent: parent node
-        game_state: nested lists that represent where players have moved 
-        player: player who just moved in order to end up at this game state
-        is_end_state: boolean indicating whether the game state is a win/draw
-
-    Methods
-        __init__
-    """
-    def __init__(self, game, player, parent = None):
-        """Initializes attributes of new nodes
-
-        Parameters
-            game: nested lists that represent where players have moved
-            player: player that moved to reach game state
-            parent: parent node or None
-        """
-        self.wins = 0
-        self.visits = 0
-        self.children = []
-        self.parent = parent
-        self.game_state = game
-        self.player = player
-        self.is_end_state = False
-
-
-def traverse(current_node):
-    """Traverses down the tree starting from the root by either choosing 
-    a child node that hasn't been visited, or choosing the node with the
-    highest UCB1 value in the case that all child nodes have been visited
-    at least once.
-
-    Parameters
-        current_node: Node
-            The parent whose children will be interrogated.
-
-    Returns
-        node: Node
-            The leaf node that the function traversed to.
-    """
-    current = current_node
-    if current.children == []:
-        return current
-    elif any(x.visits == 0 for x in current.children):
-        for child in current.children:
-            if child.visits == 0:
-                current = child
-                return current
-    else:
-        current = current.children[max_UCB1_index(current)]
-        current = traverse(current)
-        return current  
-
-def max_UCB1_index(current):
-    """Iterates through children of parent node and returns the index
-    of the child with the highest UCB1 score.
-
-    Parameters
-        current: Node
-            The parent node whose children will be interrogated.
-
-    Returns
-        index: int
-            The index of child node with highest UCB1 score.
-    """
-    index = 0
-    max_UCB1 = calculate_UCB1(current.children[index])
-    for i in range(len(current.children)):
-        UCB1 = calculate_UCB1(current.children[i])
-        if UCB1 > max_UCB1:
-            max_UCB1 = UCB1
-            index = i
-    return index
-
-def calculate_UCB1(child):
-    """Calculates UCB1 score of a node in the tree and returns the.
-    score
-
-    Parameters
-        child: Node
-            The child node whose UCB1 score is to be calculated.
-
-    Returns
-        exploitation + exploration_constant * exploration: float
-            UCB1 score
-    """
-    num_wins = child.wins
-    num_visits = child.visits
-    exploration_constant = 1.4
-    num_parent_visits = child.parent.visits
-    exploitation = float(num_wins / num_visits)
-    exploration = math.sqrt(math.log2(num_parent_visits) / num_visits)
-    return exploitation + exploration_constant * exploration
-
-def expand(current):
-    """Generates all legal game states from a given game state and
-    creates new nodes from these game states. Appends these newly
-    created nodes to the list of children of the parent node.
-
-    Parameters
-        current: Node
-            Parent node whose children will be generated and added
-            to child list.
-    """
-    current_game_state = copy.deepcopy(current.game_state)
-    for x, row in enumerate(current_game_state):
-        for y, place in enumerate(row):
-            if current_game_state[x][y] == "X": 
-                player_num = 1 if current.player == 2 else 2
-                game = copy.deepcopy(current_game_state)
-                game[x][y] = player_num
-                child = Node(game, player_num, current)
-                if check_for_draw(child.game_state):
-                    child.is_end_state = True
-                if check_for_win(child.game_state, player_num):
-                    child.is_end_state = True
-                current.children.append(child)
-
-def check_for_win(game_board, player):
-    """Checks to see if a win has been acheived by the player
-    who just moved given a current game state. First checks
-    for a win on the rows, then the columns, then the diagonals.
-
-    Parameters
-        game_board: nested lists
-            The reprensentation of game state and where each player
-            has moved.
-        player: int
-            The player that just moved to reach game_board game
-            state.
-
-    Returns
-        is_win: boolean
-            The truth value of whether a wins has been acheived.
-    """
-    is_win = False
-    for i in range(3):
-        if (game_board[i][0] == player and
-            game_board[i][1] == player and
-            game_board[i][2] == player):
-            is_win = True
-            return is_win
-        
-        if (game_board[0][i] == player and
-            game_board[1][i] == player and
-            game_board[2][i] == player):
-            is_win = True
-            return is_win
-    
-    if (game_board[0][0] == player and
-        game_board[1][1] == player and
-        game_board[2][2] == player):
-        is_win = True
-        return is_win
-    
-    if (game_board[0][2] == player and
-        game_board[1][1] == player and
-        game_board[2][0] == player):
-        is_win = True
-        return is_win
-    
-    return is_win
-
-def check_for_draw(game):
-    """Checks to see if a draw has been acheived given a game
-    state.
-
-    Parameters
-        game: nested lists
-            The representation of the game board and where each
-            player has moved.
-        
-    Returns
-        True or False
-            The truth value of whether a draw has been acheived.
-    """
-    l = [x for y in game for x in y]
-    if any(x == "X" for x in l):
-        return False
-    else:
-        return True
-   
-def rollout(game_state, player):
-    """Creates a copy of the game state and makes random, alternating
-    moves until a win or draw is acheived.
-
-    Parameters
-        game_state: nested lists
-            The representation of the game board and where each
-            player has moved.
-        player: int
-            The player that just moved to reach the game state.
-
-    Returns
-        player_num: int
-            The player who acheived the win.
-        -20: int
-            An arbitrary number that will be returned if a draw is 
-            acheived.
-    """
-    current_game_state = copy.deepcopy(game_state)
-    player_num = copy.deepcopy(player)
-    while (not check_for_win(current_game_state, player_num) 
-           and not check_for_draw(current_game_state)):
-        rand_row = randint(0, 2)
-        rand_col = randint(0, 2)
-        while current_game_state[rand_row][rand_col] != "X":
-            rand_row = randint(0, 2)
-            rand_col = randint(0, 2)
-        player_num = 2 if player_num == 1 else 1
-        current_game_state[rand_row][rand_col] = player_num
-    if check_for_win(current_game_state, player_num):   
-        return player_num
-    elif check_for_draw(current_game_state):
-        return -20
-
-def back_propagate(current_node, rollout_result):
-    """Traverses from leaf node, back up to the root node and updates
-    each traversed node's wins and visits attributes based on the
-    result of the rollout
-
-    Parameters
-        current_node: Node
-            The leaf node from where the rollout was initiated.
-        rollout_result: int
-            The player who achieved the win during the rollout,
-            or an arbitrary number to indicate a draw.
-    """
-    current = current_node
-    while current != None:
-        if rollout_result == -20:
-            current.wins += 0.5
-            current.visits += 1
-            current = current.parent
-        else:
-            if current.player == rollout_result:
-                current.wins += 1
-                current.visits += 1
-            else:
-                current.visits += 1
-            current = current.parent
-
-def calc_highest_visits(node):
-    """Iterates through a nodes children to find the child that
-    was visited the most.
-
-    Parameters
-        node: Node
-            The parent node whose children will be interrogated.
-    
-    Returns
-        node.children[index].game_state: nested lists
-            The representation of the game board and where each
-            player has moved.
-    """
-    index = 0
-    highest_visits = node.children[index].visits
-    for i in range(len(node.children)):
-        if node.children[i].visits > highest_visits:
-            index = i
-            highest_visits = node.children[i].visits
-    return node.children[index].game_state
-
-def find_comp_move(game_state, comp_move_state):
-    """Determines the row and column where the computer should
-    move based on the difference in the current game state and
-    the game state of the child node that was visited the most.
-
-    Parameters
-        game_state: nested lists
-            The representation of the current game board and
-            where each player has moved.
-        comp_move_state: nested lists
-            The representation of the game board and where
-            the computer should move
-        
-    Returns
-        x, y: ints
-            The row and column of where the computer should 
-            move on the game board
-        -1, -1: ints
-            The arbitrary numbers returned if there isn't a 
-            difference between current game board and game
-            board of child where the computer should move.
-            This should not be reachable.
-    """
-    for x, row in enumerate(game_state):
-        for y, col in enumerate(row):
-            if game_state[x][y] != comp_move_state[x][y]:
-                return x, y
-            
-    return -1, -1
-
-def make_comp_move(state, num):
-    """The procedure for making a computer move. Follows the classic
-    Monte Carlo Tree Search process of Selection, Expansion, Simulation,
-    and Back-propagation. The number of iterations to execute before
-    making a computer move is set to 1000. 
-
-    Parameters
-        state: nested lists
-            The representation of the game board and where each player
-            has moved.
-        num: int
-            The player number of the human competitor.
-
-    Returns
-        comp_row, comp_col: ints
-            The row and column of where the computer should move
-            on the game board.
-    """
-    root = Node(state, num)
-    
-    for num_iter in range(1000):
-        current = traverse(root)
-        if current.visits == 0 or current.is_end_state is True:
-            rollout_result = rollout(current.game_state, current.player)
-            back_propagate(current, rollout_result)
-        else:
-            expand(current)
-            child = current.children[0]
-            rollout_result = rollout(child.game_state, child.player)
-            back_propagate(child, rollout_result)
-
-    comp_move_state = calc_highest_visits(root)
-    comp_row, comp_col = find_comp_move(root.game_state, comp_move_state)
-    del root
-    return comp_row, comp_col
-
-class TicTacToe:
-    """A new TicTacToe game. This will be created once human competitor
-    chooses which player they want to be.
-
-    Attributes
-        game_board: representation of the game board and where each
-        player has moved
-        user_num: the player number of the human competitor
-        comp_piece: the player number of the computer competitor
-
-    Methods
-        __init__
-        print_game_board
-        check_for_legality
-        make_player_move
-    """
-    def __init__(self, user_piece, comp_piece):
-        """Initialize the attributes of a new TicTacToe game.
-
-        Parameters
-            user_piece: int
-                The player number of the human competitor.
-            comp_piece: int
-                The player number of the computer competitor.
-        """
-        self.game_board = [["X", "X", "X"], ["X", "X", "X"], ["X", "X", "X"]]
-        self.user_num = user_piece
-        self.comp_piece = comp_piece
-
-    def print_game_board(self):
-        """Prints a representation of the game board and where
-        each player has moved.
-        """
-        i = 1
-        print("\t1\t2\t3\n")
-        for row in self.game_board:
-            print(f"{i}\t", end = "")
-            for item in row:
-                print(f"{item}\t", end = "")
-            print("\n")
-            i += 1
-
-    def check_for_legality(self, row, col):
-        """Checks to see if a player move is legal according to 
-        the rules of TicTacToe.
-
-        Parameters
-            row: int
-                The row where the human player would like to move.
-            col: int
-                The column where the human player would like to move.
-
-        Returns
-            is_legal: boolean
-                The truth value of whether a human move is legal or not.
-        """
-        is_legal = True
-        if row not in [1, 2, 3]:
-            is_legal = False
-        if col not in [1, 2, 3]:
-            is_legal = False
-        if self.game_board[row - 1][col - 1] != "X":
-            is_legal = False
-        return is_legal
-
-    def make_player_move(self, row, col):
-        """Updates the game board to represent where the human
-        player moved.
-
-        Parameters
-            row: int
-                The row where the human player would like to move.
-            col: int
-                The column where the human player would like to move.
-        """
-        self.game_board[row - 1][col - 1] = self.user_num
-
-# Begin script        
-first_to_move = input("Enter 0 if you would like to go first, otherwise enter any other number: ")
-
-if first_to_move == "0":
-    print("You are Player 1. Your moves will be denoted by \"1\"")
-    print("The computer is Player 2. Computer moves will be denoted by \"2\"")
-    print("X's denote an empty cell")
-    game = TicTacToe(1, 2)
-else:
-    print("You are Player 2. Your moves will be denoted by \"2\"")
-    print("The computer is Player 1. Computer moves will be denoted by \"1\"")
-    print("X's denote an empty cell")
-    game = TicTacToe(2, 1)
-    game_state = copy.deepcopy(game.game_board)
-    comp_row, comp_col = make_comp_move(game_state, game.user_num)
-    game.game_board[comp_row][comp_col] = game.comp_piece
-
-game.print_game_board()
-
-# Main game loop
-while True:
-
-    while True:
-        user_row = int(input("Enter row number you would like to move to: "))
-        user_col = int(input("Enter column number you would like to move to: "))
-        
-        if game.check_for_legality(user_row, user_col):
-            game.make_player_move(user_row, user_col)
-            break
-        else:
-            print("That is not a valid move")
-
-    if check_for_win(game.game_board, game.user_num):
-        game.print_game_board()
-        print("Congrats, you have won!")
-        break
-    if check_for_draw(game.game_board):
-        game.print_game_board()
-        print("It's a draw! Try again.")
-        break
-    game_state = copy.deepcopy(game.game_board)
-    player_num = copy.deepcopy(game.user_num)
-    comp_row, comp_col = make_comp_move(game_state, player_num)
-    game.game_board[comp_row][comp_col] = game.comp_piece
-
-    game.print_game_board()
-
-    if check_for_win(game.game_board, game.comp_piece):
-        print("You lost to a computer! Sad day.")
-        break
-    if check_for_draw(game.game_board):
-        print("It's a draw! Try again.")
-        break
-
-print("End of program")
+from typing import Any
+import math
+import multiprocessing
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+
+# NumPy and Numba are optional: with Numba installed every rollout runs in a
+# compiled kernel, with only NumPy installed the rollouts for a leaf are
+# simulated as one vectorized batch, and the pure-Python versions are used
+# when neither is available.
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    import numba
+except ImportError:
+    numba = None
+
+# The eight winning lines of the board encoded as 9-bit masks. Bit i of a
+# player's mask corresponds to the square at row i // 3, column i % 3.
+WINS = (0b000000111, 0b000111000, 0b111000000,
+        0b001001001, 0b010010010, 0b100100100,
+        0b100010001, 0b001010100)
+
+# Mask with all nine squares occupied; a position whose combined masks reach
+# this with no winning line is a draw.
+FULL_BOARD = 0b111111111
+
+def build_symmetry_tables():
+    """Builds one 512-entry lookup table per symmetry of the board (the
+    four rotations and four reflections of the dihedral group), each
+    mapping a 9-bit mask to the transformed mask. With the tables,
+    transforming a whole position is two list lookups.
+
+    Returns
+        tables: tuple of lists
+            Eight 512-entry mask-to-mask lookup tables.
+    """
+    transforms = ((lambda r, c: (r, c)),
+                  (lambda r, c: (c, 2 - r)),
+                  (lambda r, c: (2 - r, 2 - c)),
+                  (lambda r, c: (2 - c, r)),
+                  (lambda r, c: (r, 2 - c)),
+                  (lambda r, c: (2 - r, c)),
+                  (lambda r, c: (c, r)),
+                  (lambda r, c: (2 - c, 2 - r)))
+    tables = []
+    for transform in transforms:
+        perm = [0] * 9
+        for square in range(9):
+            row, col = divmod(square, 3)
+            new_row, new_col = transform(row, col)
+            perm[square] = new_row * 3 + new_col
+        table = [0] * 512
+        for mask in range(512):
+            transformed = 0
+            for square in range(9):
+                if (mask >> square) & 1:
+                    transformed |= 1 << perm[square]
+            table[mask] = transformed
+        tables.append(table)
+    return tuple(tables)
+
+SYMMETRY_TABLES = build_symmetry_tables()
+
+def canonical_key(p1_mask, p2_mask, player):
+    """Returns the transposition-table key for a position: the smallest
+    packed (p1, p2) pair over the eight board symmetries, plus the
+    player who just moved. Positions that are rotations or reflections
+    of each other share a key, and therefore a node and its statistics.
+
+    Parameters
+        p1_mask: int
+            The 9-bit mask marking where player 1 has moved.
+        p2_mask: int
+            The 9-bit mask marking where player 2 has moved.
+        player: int
+            The player that just moved to reach the position.
+
+    Returns
+        (packed, player): tuple
+            The canonical position packed into one int, and the player.
+    """
+    best = (p1_mask << 9) | p2_mask
+    for table in SYMMETRY_TABLES:
+        packed = (table[p1_mask] << 9) | table[p2_mask]
+        if packed < best:
+            best = packed
+    return (best, player)
+
+# The same eight masks packed into consecutive 9-bit fields of a single int,
+# with the field-wise constants used by the zero-field test in check_for_win.
+WINS_PACKED = sum(w << (9 * i) for i, w in enumerate(WINS))
+FIELD_ONES = sum(1 << (9 * i) for i in range(8))
+FIELD_HIGH = FIELD_ONES << 8
+
+if np is not None:
+    WINS_ARRAY = np.array(WINS, dtype=np.int64)
+
+# Number of game simulations to run before making a computer move, and the
+# number of simulations played from each selected leaf.
+NUM_SIMULATIONS = 1000
+ROLLOUT_BATCH = 8
+
+# Rollout batches are dispatched to a pool of worker processes, up to this
+# many in flight at once (WU-UCT style: the visit counts for a dispatched
+# batch are applied up front so later selections in the same wave stay
+# well-defined). The pool relies on fork so workers inherit the module;
+# without fork the batches just run sequentially in-process.
+ROLLOUT_WORKERS = min(4, os.cpu_count() or 1)
+
+rollout_pool = None
+
+def seed_rollout_worker():
+    """Reseeds the random generators in a forked rollout worker so the
+    workers do not all inherit an identical random stream from the
+    parent process. The compiled rollout kernel keeps its own np.random
+    state, separate from the interpreted one, so it is reseeded through
+    a compiled shim of its own.
+    """
+    random.seed()
+    if np is not None:
+        np.random.seed()
+    if numba is not None:
+        seed_rollout_jit(random.randrange(2 ** 31))
+
+def get_rollout_pool():
+    """Returns the shared rollout worker pool, creating it on first
+    use, or None when running on a single core or fork is unavailable.
+
+    Returns
+        rollout_pool: ProcessPoolExecutor or None
+            The pool that rollout batches should be submitted to.
+    """
+    global rollout_pool
+    if (rollout_pool is None and ROLLOUT_WORKERS > 1
+            and "fork" in multiprocessing.get_all_start_methods()):
+        rollout_pool = ProcessPoolExecutor(
+            ROLLOUT_WORKERS,
+            mp_context = multiprocessing.get_context("fork"),
+            initializer = seed_rollout_worker)
+    return rollout_pool
+
+# Transposition table mapping (p1_mask, p2_mask, player) to the Node already
+# created for that position, so positions reached through different move
+# orders share a single node and its statistics. It is kept from one turn to
+# the next, which lets each computer move start from whatever statistics the
+# previous searches already gathered for the current position.
+transposition_table = {}
+
+class Node:
+    """A node to be inserted into the tree during the Monte Carlo Tree Search.
+    New nodes are created during the expand() function and the make_comp_move()
+    function.
+
+    Attributes
+        wins: number of wins acheived by traversing path with this node
+        visits: number of times node has been traversed
+        children: nodes that represent legal next moves
+        game_state: tuple (p1_mask, p2_mask) of 9-bit ints marking where
+        each player has moved
+        player: player who just moved in order to end up at this game state
+        is_end_state: boolean indicating whether the game state is a win/draw
+        terminal_result: the winning player for an end state, -20 for a
+        drawn end state, or None when the game is still going
+        empties: list of empty square indices (0..8) in this game state
+        inv_visits: cached 1.0 / visits, maintained by back_propagate
+        child_wins, child_visits, child_inv: per-child stats mirrored into
+        parallel lists so the selection step scores children without
+        touching the child objects
+        child_moves: the square played to reach each child from this node;
+        kept per parent because a child shared across symmetric positions
+        can hold the game state of a rotated or reflected variant
+
+    Methods
+        __init__
+    """
+    __slots__ = ("wins", "visits", "children", "game_state", "player",
+                 "is_end_state", "terminal_result", "inv_visits",
+                 "child_wins", "child_visits", "child_inv", "child_moves",
+                 "empties")
+
+    def __init__(self, game, player):
+        """Initializes attributes of new nodes
+
+        Parameters
+            game: tuple (p1_mask, p2_mask) of ints marking where each
+            player has moved
+            player: player that moved to reach game state
+        """
+        self.wins = 0
+        self.visits = 0
+        self.children = []
+        self.game_state = game
+        self.player = player
+        self.is_end_state = False
+        self.terminal_result = None
+        self.inv_visits = 0.0
+        self.child_wins = []
+        self.child_visits = []
+        self.child_inv = []
+        self.child_moves = []
+        occupied = game[0] | game[1]
+        self.empties = [i for i in range(9) if not (occupied >> i) & 1]
+
+
+def traverse(current_node):
+    """Traverses down the tree starting from the root by either choosing
+    a child node that hasn't been visited, or choosing the node with the
+    highest UCB1 value in the case that all child nodes have been visited
+    at least once. The descent is a single iterative loop: at each level
+    the log of the parent's visit count is computed once, and one pass
+    over the parent's per-child stat lists both short-circuits on the
+    first unvisited child and tracks the highest UCB1 score, without
+    touching the child objects themselves. The descent records each
+    visited node along the way, so the update step walks that list
+    instead of chasing parent pointers - which also keeps the updates on
+    the path actually traversed when a transposition-shared node is
+    reachable from several parents.
+
+    Parameters
+        current_node: Node
+            The parent whose children will be interrogated.
+
+    Returns
+        node: Node
+            The leaf node that the function traversed to.
+        path: list of (Node, int) tuples
+            The nodes from the root down to the leaf, each paired with
+            its index in its parent (None for the root).
+    """
+    _log1p = math.log1p
+    _sqrt = math.sqrt
+    current = current_node
+    path = [(current, None)]
+    while current.children:
+        # log1p keeps the exploration term positive even when the parent
+        # has a single visit, where plain log would zero it out; the
+        # exploration constant is retuned to 1.0 for the shifted count.
+        log_n = _log1p(current.visits)
+        child_wins = current.child_wins
+        child_visits = current.child_visits
+        child_inv = current.child_inv
+        best = 0
+        best_UCB1 = -1.0
+        for i in range(len(child_visits)):
+            if child_visits[i] == 0:
+                best = i
+                break
+            inv = child_inv[i]
+            UCB1 = child_wins[i] * inv + 1.0 * _sqrt(log_n * inv)
+            if UCB1 > best_UCB1:
+                best_UCB1 = UCB1
+                best = i
+        chosen = current.children[best]
+        path.append((chosen, best))
+        if child_visits[best] == 0:
+            return chosen, path
+        current = chosen
+    return current, path
+
+def expand(current):
+    """Generates all legal game states from a given game state and
+    creates new nodes from these game states, storing them in the
+    children list of the parent node. Positions are keyed canonically,
+    so a state already seen this game - including as a rotation or
+    reflection - is looked up in the transposition table instead of
+    being allocated again, and moves of the parent that lead to
+    symmetric positions are merged into a single child. The square
+    actually played for each child is recorded in child_moves.
+
+    Parameters
+        current: Node
+            Parent node whose children will be generated and added
+            to child list.
+    """
+    p1, p2 = current.game_state
+    player_num = 1 if current.player == 2 else 2
+    children = [None] * len(current.empties)
+    moves = [None] * len(current.empties)
+    seen = set()
+    count = 0
+    for square in current.empties:
+        bit = 1 << square
+        game = (p1 | bit, p2) if player_num == 1 else (p1, p2 | bit)
+        key = canonical_key(game[0], game[1], player_num)
+        if key in seen:
+            continue
+        seen.add(key)
+        child = transposition_table.get(key)
+        if child is None:
+            child = Node(game, player_num)
+            if check_for_draw(game[0], game[1]):
+                child.is_end_state = True
+                child.terminal_result = -20
+            if check_for_win(game[player_num - 1]):
+                child.is_end_state = True
+                child.terminal_result = player_num
+            transposition_table[key] = child
+        children[count] = child
+        moves[count] = square
+        count += 1
+    del children[count:]
+    del moves[count:]
+    current.children = children
+    current.child_moves = moves
+    current.child_wins = [c.wins for c in children]
+    current.child_visits = [c.visits for c in children]
+    current.child_inv = [c.inv_visits for c in children]
+
+def check_for_win(player_mask):
+    """Checks to see if a win has been acheived by the player
+    who just moved given that player's mask. A win is present
+    when the mask covers one of the eight winning line masks.
+    All eight lines are tested at once: the mask is broadcast
+    into the eight 9-bit fields with one multiply, combined with
+    the packed line masks, and a win shows up as a zero field,
+    found with the usual SWAR zero-field test.
+
+    Parameters
+        player_mask: int
+            The 9-bit mask marking where the player who just
+            moved has played.
+
+    Returns
+        is_win: boolean
+            The truth value of whether a wins has been acheived.
+    """
+    missing = (player_mask * FIELD_ONES) & WINS_PACKED ^ WINS_PACKED
+    return ((missing - FIELD_ONES) & ~missing & FIELD_HIGH) != 0
+
+def check_for_draw(p1_mask, p2_mask):
+    """Checks to see if a draw has been acheived given both
+    player masks.
+
+    Parameters
+        p1_mask: int
+            The 9-bit mask marking where player 1 has moved.
+        p2_mask: int
+            The 9-bit mask marking where player 2 has moved.
+
+    Returns
+        True or False
+            The truth value of whether a draw has been acheived.
+    """
+    return (p1_mask | p2_mask) == FULL_BOARD
+
+def rollout(game_state, player_num):
+    """Makes random, alternating moves from a game state until a win
+    or draw is acheived. Moves are drawn uniformly from a local
+    empty-square list by swapping the chosen square with the last
+    entry and popping, so every draw is O(1) with no retries. Takes
+    the game state by value so it can be shipped to a rollout worker
+    process.
+
+    Parameters
+        game_state: tuple
+            The (p1_mask, p2_mask) pair marking where each player
+            has moved.
+        player_num: int
+            The player that just moved to reach the game state.
+
+    Returns
+        player_num: int
+            The player who acheived the win.
+        -20: int
+            An arbitrary number that will be returned if a draw is
+            acheived.
+    """
+    _rand = random.random
+    _check_for_win = check_for_win
+    p1, p2 = game_state
+    if _check_for_win(p1 if player_num == 1 else p2):
+        return player_num
+    occupied = p1 | p2
+    empties = [i for i in range(9) if not (occupied >> i) & 1]
+    while empties:
+        i = int(_rand() * len(empties))
+        square = empties[i]
+        empties[i] = empties[-1]
+        empties.pop()
+        player_num = 2 if player_num == 1 else 1
+        if player_num == 1:
+            p1 |= 1 << square
+        else:
+            p2 |= 1 << square
+        if _check_for_win(p1 if player_num == 1 else p2):
+            return player_num
+    return -20
+
+if numba is not None:
+    @numba.njit(cache=True)
+    def rollout_jit(p1, p2, player_num):
+        """Compiled rollout kernel. Plays random, alternating moves on
+        the two 9-bit masks until a win or draw is acheived, picking
+        each move as a uniformly random set bit of the empty mask.
+
+        Parameters
+            p1: int
+                The 9-bit mask marking where player 1 has moved.
+            p2: int
+                The 9-bit mask marking where player 2 has moved.
+            player_num: int
+                The player that just moved to reach the game state.
+
+        Returns
+            player_num: int
+                The player who acheived the win.
+            -20: int
+                An arbitrary number that will be returned if a draw is
+                acheived.
+        """
+        mask = p1 if player_num == 1 else p2
+        for w in WINS_ARRAY:
+            if (mask & w) == w:
+                return player_num
+        empty = FULL_BOARD & ~(p1 | p2)
+        while empty:
+            count = 0
+            e = empty
+            while e:
+                count += 1
+                e &= e - 1
+            e = empty
+            for _ in range(np.random.randint(0, count)):
+                e &= e - 1
+            bit = e & (-e)
+            empty ^= bit
+            player_num = 2 if player_num == 1 else 1
+            if player_num == 1:
+                p1 |= bit
+                mask = p1
+            else:
+                p2 |= bit
+                mask = p2
+            for w in WINS_ARRAY:
+                if (mask & w) == w:
+                    return player_num
+        return -20
+
+    def rollout(game_state, player_num):
+        """Replaces the pure-Python rollout above with a call into the
+        compiled kernel when Numba is available.
+
+        Parameters
+            game_state: tuple
+                The (p1_mask, p2_mask) pair marking where each player
+                has moved.
+            player_num: int
+                The player that just moved to reach the game state.
+
+        Returns
+            player_num: int
+                The player who acheived the win.
+            -20: int
+                An arbitrary number that will be returned if a draw is
+                acheived.
+        """
+        return rollout_jit(game_state[0], game_state[1], player_num)
+
+    @numba.njit(cache=True)
+    def seed_rollout_jit(seed):
+        """Seeds the random generator used inside compiled code. Numba
+        gives njit functions their own np.random state, so reseeding
+        from interpreted code never reaches the rollout kernel.
+
+        Parameters
+            seed: int
+                The seed for the compiled generator.
+        """
+        np.random.seed(seed)
+
+def rollout_batch(game_state, player_num, n):
+    """Plays n independent rollouts from a game state. With Numba
+    available the scalar rollout - and through it the compiled
+    kernel - is called n times, which at this batch size beats the
+    per-ply array machinery. Otherwise, with NumPy available, all n
+    games are simulated in lockstep on arrays of masks: each ply
+    draws one random empty square per game by masking random
+    priorities onto the empty bits and taking the argmax, and games
+    that have already been won are frozen in place. Without either
+    the scalar rollout is simply called n times. Takes the game
+    state by value so it can be shipped to a rollout worker process.
+
+    Parameters
+        game_state: tuple
+            The (p1_mask, p2_mask) pair marking where each player
+            has moved.
+        player_num: int
+            The player that just moved to reach the game state.
+        n: int
+            The number of games to simulate.
+
+    Returns
+        p1_wins, p2_wins, draws: ints
+            How many of the n games each player won, and how many
+            were drawn.
+    """
+    if np is None or numba is not None:
+        p1_wins = p2_wins = 0
+        for _ in range(n):
+            result = rollout(game_state, player_num)
+            if result == 1:
+                p1_wins += 1
+            elif result == 2:
+                p2_wins += 1
+        return p1_wins, p2_wins, n - p1_wins - p2_wins
+
+    start_p1, start_p2 = game_state
+    if check_for_win(start_p1 if player_num == 1 else start_p2):
+        return (n, 0, 0) if player_num == 1 else (0, n, 0)
+
+    p1 = np.full(n, start_p1, dtype=np.int64)
+    p2 = np.full(n, start_p2, dtype=np.int64)
+    winner = np.zeros(n, dtype=np.int64)
+    squares = np.arange(9)
+    num_empty = 9 - bin(start_p1 | start_p2).count("1")
+    for _ in range(num_empty):
+        active = winner == 0
+        empty = FULL_BOARD & ~(p1 | p2)
+        priority = np.random.random((n, 9)) * ((empty[:, None] >> squares) & 1)
+        bit = np.int64(1) << priority.argmax(1)
+        player_num = 2 if player_num == 1 else 1
+        if player_num == 1:
+            p1 = np.where(active, p1 | bit, p1)
+            moved = p1
+        else:
+            p2 = np.where(active, p2 | bit, p2)
+            moved = p2
+        won = ((moved[:, None] & WINS_ARRAY) == WINS_ARRAY).any(1)
+        winner = np.where(active & won, player_num, winner)
+    p1_wins = int((winner == 1).sum())
+    p2_wins = int((winner == 2).sum())
+    return p1_wins, p2_wins, n - p1_wins - p2_wins
+
+def apply_virtual_visits(path, n):
+    """Counts a dispatched batch of n rollouts as unobserved samples
+    (WU-UCT) by adding their visits along the selection path before
+    the results are known, keeping UCB1 well-defined for the other
+    selections in the same wave. Each node's new counts are mirrored
+    into its parent's child stat lists.
+
+    Parameters
+        path: list of (Node, int) tuples
+            The nodes from the root down to the leaf, as recorded by
+            traverse.
+        n: int
+            The number of rollouts that were dispatched.
+    """
+    for i, (node, index) in enumerate(path):
+        node.visits += n
+        node.inv_visits = 1.0 / node.visits
+        if index is not None:
+            parent = path[i - 1][0]
+            parent.child_visits[index] = node.visits
+            parent.child_inv[index] = node.inv_visits
+
+def back_propagate(path, p1_wins, p2_wins, draws):
+    """Walks the recorded selection path and updates each node's wins
+    based on the aggregated results of the batch of rollouts, mirroring
+    the new totals into the parent's child stat lists. The visits were
+    already counted when the batch was dispatched, so only the wins are
+    applied here.
+
+    Parameters
+        path: list of (Node, int) tuples
+            The nodes from the root down to the leaf, as recorded by
+            traverse.
+        p1_wins: int
+            The number of rollouts player 1 won.
+        p2_wins: int
+            The number of rollouts player 2 won.
+        draws: int
+            The number of rollouts that were drawn.
+    """
+    for i, (node, index) in enumerate(path):
+        node.wins += ((p1_wins if node.player == 1 else p2_wins)
+                      + 0.5 * draws)
+        if index is not None:
+            path[i - 1][0].child_wins[index] = node.wins
+
+def calc_highest_visits(node):
+    """Iterates through a nodes children to find the child that
+    was visited the most.
+
+    Parameters
+        node: Node
+            The parent node whose children will be interrogated.
+
+    Returns
+        index: int
+            The index of the child that was visited the most.
+    """
+    index = 0
+    highest_visits = node.child_visits[index]
+    for i in range(len(node.child_visits)):
+        if node.child_visits[i] > highest_visits:
+            index = i
+            highest_visits = node.child_visits[i]
+    return index
+
+def make_comp_move(state, num):
+    """The procedure for making a computer move. Follows the classic
+    Monte Carlo Tree Search process of Selection, Expansion, Simulation,
+    and Back-propagation. Each selected leaf is evaluated with a batch
+    of ROLLOUT_BATCH independent rollouts, for NUM_SIMULATIONS games in
+    total per computer move. Up to ROLLOUT_WORKERS batches are selected
+    per wave and simulated in parallel by the worker pool: the visits of
+    each dispatched batch are applied to its selection path up front as
+    unobserved samples (WU-UCT), and the wins are back-propagated once
+    the batch completes. The search tree is retained between turns
+    through the transposition table: the root is looked up there so
+    statistics gathered on earlier turns carry over, and only the
+    simulations still missing from the root's count are run.
+
+    Parameters
+        state: tuple
+            The (p1_mask, p2_mask) pair marking where each player
+            has moved.
+        num: int
+            The player number of the human competitor.
+
+    Returns
+        comp_row, comp_col: ints
+            The row and column of where the computer should move
+            on the game board.
+    """
+    key = canonical_key(state[0], state[1], num)
+    root = transposition_table.get(key)
+    if root is not None and root.game_state != state:
+        # The table holds a symmetric variant of this position. Its
+        # subtree is still shared through expand's canonical lookups,
+        # but the root must carry the actual state so that child_moves
+        # name squares on the real board.
+        root = None
+    if root is None:
+        root = Node(state, num)
+        transposition_table.setdefault(key, root)
+    pool = get_rollout_pool()
+    _traverse = traverse
+    _apply_virtual_visits = apply_virtual_visits
+    _back_propagate = back_propagate
+
+    num_batches = max(1, (NUM_SIMULATIONS - root.visits) // ROLLOUT_BATCH)
+    batches_done = 0
+    while batches_done < num_batches:
+        wave = min(ROLLOUT_WORKERS, num_batches - batches_done)
+        pending = []
+        for _ in range(wave):
+            current, path = _traverse(root)
+            if current.visits == 0 or current.is_end_state is True:
+                leaf = current
+            else:
+                expand(current)
+                leaf = current.children[0]
+                path.append((leaf, 0))
+            _apply_virtual_visits(path, ROLLOUT_BATCH)
+            if leaf.is_end_state is True:
+                # The outcome is already known, so no rollouts are run.
+                if leaf.terminal_result == 1:
+                    _back_propagate(path, ROLLOUT_BATCH, 0, 0)
+                elif leaf.terminal_result == 2:
+                    _back_propagate(path, 0, ROLLOUT_BATCH, 0)
+                else:
+                    _back_propagate(path, 0, 0, ROLLOUT_BATCH)
+                continue
+            if pool is not None:
+                result = pool.submit(rollout_batch, leaf.game_state,
+                                     leaf.player, ROLLOUT_BATCH)
+            else:
+                result = rollout_batch(leaf.game_state, leaf.player,
+                                       ROLLOUT_BATCH)
+            pending.append((path, result))
+        for path, result in pending:
+            if pool is not None:
+                result = result.result()
+            p1_wins, p2_wins, draws = result
+            _back_propagate(path, p1_wins, p2_wins, draws)
+        batches_done += wave
+
+    best_index = calc_highest_visits(root)
+    square = root.child_moves[best_index]
+    return square // 3, square % 3
+
+class TicTacToe:
+    """A new TicTacToe game. This will be created once human competitor
+    chooses which player they want to be.
+
+    Attributes
+        p1_mask: 9-bit int marking where player 1 has moved
+        p2_mask: 9-bit int marking where player 2 has moved
+        user_num: the player number of the human competitor
+        comp_piece: the player number of the computer competitor
+
+    Methods
+        __init__
+        print_game_board
+        check_for_legality
+        place_piece
+        make_player_move
+    """
+    def __init__(self, user_piece, comp_piece):
+        """Initialize the attributes of a new TicTacToe game.
+
+        Parameters
+            user_piece: int
+                The player number of the human competitor.
+            comp_piece: int
+                The player number of the computer competitor.
+        """
+        self.p1_mask = 0
+        self.p2_mask = 0
+        self.user_num = user_piece
+        self.comp_piece = comp_piece
+
+    def print_game_board(self):
+        """Prints a representation of the game board and where
+        each player has moved. "X" survives only as the display
+        glyph for an empty square; nothing in the game state
+        stores it.
+        """
+        print("\t1\t2\t3\n")
+        for row in range(3):
+            print(f"{row + 1}\t", end = "")
+            for col in range(3):
+                bit = 1 << (row * 3 + col)
+                if self.p1_mask & bit:
+                    item = 1
+                elif self.p2_mask & bit:
+                    item = 2
+                else:
+                    item = "X"
+                print(f"{item}\t", end = "")
+            print("\n")
+
+    def check_for_legality(self, row, col):
+        """Checks to see if a player move is legal according to
+        the rules of TicTacToe.
+
+        Parameters
+            row: int
+                The row where the human player would like to move.
+            col: int
+                The column where the human player would like to move.
+
+        Returns
+            is_legal: boolean
+                The truth value of whether a human move is legal or not.
+        """
+        is_legal = True
+        if row not in [1, 2, 3]:
+            is_legal = False
+        if col not in [1, 2, 3]:
+            is_legal = False
+        if is_legal and ((self.p1_mask | self.p2_mask)
+                         >> ((row - 1) * 3 + (col - 1))) & 1:
+            is_legal = False
+        return is_legal
+
+    def place_piece(self, player, row, col):
+        """Updates the mask of the given player to represent a
+        move at the given 0-indexed row and column.
+
+        Parameters
+            player: int
+                The player number of the piece to place.
+            row: int
+                The 0-indexed row of the move.
+            col: int
+                The 0-indexed column of the move.
+        """
+        bit = 1 << (row * 3 + col)
+        if player == 1:
+            self.p1_mask |= bit
+        else:
+            self.p2_mask |= bit
+
+    def make_player_move(self, row, col):
+        """Updates the game board to represent where the human
+        player moved.
+
+        Parameters
+            row: int
+                The row where the human player would like to move.
+            col: int
+                The column where the human player would like to move.
+        """
+        self.place_piece(self.user_num, row - 1, col - 1)
+
+# Begin script
+first_to_move = input("Enter 0 if you would like to go first, otherwise enter any other number: ")
+
+if first_to_move == "0":
+    print("You are Player 1. Your moves will be denoted by \"1\"")
+    print("The computer is Player 2. Computer moves will be denoted by \"2\"")
+    print("X's denote an empty cell")
+    game = TicTacToe(1, 2)
+else:
+    print("You are Player 2. Your moves will be denoted by \"2\"")
+    print("The computer is Player 1. Computer moves will be denoted by \"1\"")
+    print("X's denote an empty cell")
+    game = TicTacToe(2, 1)
+    game_state = (game.p1_mask, game.p2_mask)
+    comp_row, comp_col = make_comp_move(game_state, game.user_num)
+    game.place_piece(game.comp_piece, comp_row, comp_col)
+
+game.print_game_board()
+
+# Main game loop
+while True:
+
+    while True:
+        user_row = int(input("Enter row number you would like to move to: "))
+        user_col = int(input("Enter column number you would like to move to: "))
+
+        if game.check_for_legality(user_row, user_col):
+            game.make_player_move(user_row, user_col)
+            break
+        else:
+            print("That is not a valid move")
+
+    user_mask = game.p1_mask if game.user_num == 1 else game.p2_mask
+    if check_for_win(user_mask):
+        game.print_game_board()
+        print("Congrats, you have won!")
+        break
+    if check_for_draw(game.p1_mask, game.p2_mask):
+        game.print_game_board()
+        print("It's a draw! Try again.")
+        break
+    game_state = (game.p1_mask, game.p2_mask)
+    comp_row, comp_col = make_comp_move(game_state, game.user_num)
+    game.place_piece(game.comp_piece, comp_row, comp_col)
+
+    game.print_game_board()
+
+    comp_mask = game.p1_mask if game.comp_piece == 1 else game.p2_mask
+    if check_for_win(comp_mask):
+        print("You lost to a computer! Sad day.")
+        break
+    if check_for_draw(game.p1_mask, game.p2_mask):
+        print("It's a draw! Try again.")
+        break
+
+print("End of program")